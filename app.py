@@ -1,13 +1,29 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
 from datetime import date, datetime, timedelta
 import json
 import os
+import sys
+import csv
+import argparse
+import importlib.util
 from PIL import Image
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
 import base64
+import hashlib
+import html
+import re
 import requests
+import threading
+from collections import OrderedDict
+from functools import partial
+from itertools import groupby
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
 
 # =========================
 # KONFIGURACJA STRONY
@@ -28,6 +44,15 @@ REPO_OWNER = st.secrets.get("repo_owner", "")
 REPO_NAME = st.secrets.get("repo_name", "")
 REPO_BRANCH = st.secrets.get("repo_branch", "main")
 REPO_FILE_PATH = st.secrets.get("repo_file_path", "gym_progress.json")
+# Adres API można podmienić (np. na lokalną atrapę GitHuba w testach)
+GITHUB_API_URL = st.secrets.get("github_api_url", "https://api.github.com").rstrip("/")
+
+# Retencja (opcjonalna, domyślnie wyłączona): surowe wpisy z ostatnich N miesięcy, starsze
+# jako agregaty tygodniowe, a te starsze niż M miesięcy — jako agregaty miesięczne.
+# UWAGA: zwijanie jest stratne i przy pierwszym zapisie trwale przepisuje historię na GitHubie.
+RETENTION_RAW_MONTHS = st.secrets.get("retention_raw_months", None)
+RETENTION_RAW_MONTHS = int(RETENTION_RAW_MONTHS) if RETENTION_RAW_MONTHS is not None else None
+RETENTION_WEEKLY_MONTHS = int(st.secrets.get("retention_weekly_months", 24))
 
 def github_config_ok():
     return bool(GITHUB_TOKEN and REPO_OWNER and REPO_NAME and REPO_BRANCH and REPO_FILE_PATH)
@@ -38,114 +63,18 @@ def _gh_headers():
         "Accept": "application/vnd.github+json"
     }
 
-def _gh_contents_url():
-    return f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/contents/{REPO_FILE_PATH}"
-
-# =========================
-# GITHUB: wczytywanie i zapis
-# =========================
-def load_from_github() -> dict:
-    if not github_config_ok():
-        return {}
-    try:
-        url = _gh_contents_url() + f"?ref={REPO_BRANCH}"
-        r = requests.get(url, headers=_gh_headers(), timeout=15)
-        if r.status_code == 200:
-            content_b64 = r.json().get("content", "")
-            if content_b64:
-                decoded = base64.b64decode(content_b64).decode("utf-8")
-                return json.loads(decoded)
-            return {}
-        elif r.status_code == 404:
-            return {}
-        else:
-            st.warning(f"Nie udało się wczytać danych z GitHuba: {r.status_code}")
-            return {}
-    except Exception as e:
-        st.warning(f"Błąd połączenia z GitHub: {e}")
-        return {}
-
-def save_to_github(data_dict: dict, commit_message: str = "Update gym progress"):
-    if not github_config_ok():
-        st.error("Brak konfiguracji GitHub w st.secrets — zapis tylko lokalny.")
-        return False
-
-    try:
-        url = _gh_contents_url()
-        get_resp = requests.get(url, headers=_gh_headers(), timeout=15)
-        sha = get_resp.json().get("sha") if get_resp.status_code == 200 else None
-
-        json_str = json.dumps(data_dict, ensure_ascii=False, indent=2)
-        encoded_content = base64.b64encode(json_str.encode("utf-8")).decode("utf-8")
-
-        payload = {
-            "message": commit_message,
-            "content": encoded_content,
-            "branch": REPO_BRANCH
-        }
-        if sha:
-            payload["sha"] = sha
-
-        put_resp = requests.put(url, headers=_gh_headers(), json=payload, timeout=15)
-        if put_resp.status_code == 409:  # conflict
-            st.warning("⚠️ Konflikt SHA – próbuję ponownie...")
-            get_resp = requests.get(url, headers=_gh_headers(), timeout=15)
-            sha = get_resp.json().get("sha") if get_resp.status_code == 200 else None
-            if sha:
-                payload["sha"] = sha
-                put_resp = requests.put(url, headers=_gh_headers(), json=payload, timeout=15)
-
-        if put_resp.status_code in (200, 201):
-            return True
-        else:
-            st.error(f"❌ Błąd zapisu do GitHuba: {put_resp.status_code} - {put_resp.text}")
-            return False
-    except Exception as e:
-        st.error(f"❌ Wyjątek przy zapisie do GitHuba: {e}")
-        return False
-
-# =========================
-# DANE: cache + fallback
-# =========================
-@st.cache_data(show_spinner=False)
-def _initial_load_data():
-    gh_data = load_from_github()
-    if gh_data:
-        return gh_data
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-def load_data():
-    if "data_store" not in st.session_state:
-        st.session_state.data_store = _initial_load_data()
-    return st.session_state.data_store
+def _gh_repo_url():
+    return f"{GITHUB_API_URL}/repos/{REPO_OWNER}/{REPO_NAME}"
 
-def save_data(data, commit_message="Update gym progress"):
-    st.session_state.data_store = data
-    try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
-
-    ok = save_to_github(data, commit_message=commit_message)
-    if ok:
-        st.toast("✅ Zapisano do GitHuba", icon="✅")
-        _initial_load_data.clear()  # reset cache
-    return ok
+def _gh_contents_url():
+    return f"{_gh_repo_url()}/contents/{REPO_FILE_PATH}"
 
 # =========================
-# UI: odświeżanie danych
+# KONFIG: obrazy
 # =========================
-if st.sidebar.button("🔄 Odśwież dane"):
-    _initial_load_data.clear()
-    st.session_state.data_store = _initial_load_data()
-    st.toast("🔄 Dane odświeżone", icon="🔄")
+IMAGE_CACHE_DIR = ".image_cache"
+PRESHRINK_SIZE = 320  # 2x największa wyświetlana miniatura (160 px)
+IMAGE_CACHE_BUDGET_MB = float(st.secrets.get("image_cache_budget_mb", 16))
 
 # =========================
 # MAPOWANIE OBRAZKÓW
@@ -270,6 +199,8 @@ WEEKLY_PLAN = {
     }
 }
 
+DAYS_POLISH = ["Poniedziałek", "Wtorek", "Środa", "Czwartek", "Piątek", "Sobota", "Niedziela"]
+
 # =========================
 # OPISY ĆWICZEŃ
 # =========================
@@ -370,19 +301,93 @@ def image_to_base64(image):
     image.save(buffered, format="PNG")
     return base64.b64encode(buffered.getvalue()).decode()
 
-def get_exercise_image_base64(exercise_name):
-    image_file = EXERCISE_IMAGES.get(exercise_name, "brak.png")
+class ImageMemoryManager:
+    """Miniatury w pamięci z limitem bajtów i wyrzucaniem najdawniej używanych (LRU)."""
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        size = len(value)
+        with self._lock:
+            if key in self._entries:
+                self.used_bytes -= len(self._entries.pop(key))
+            if size > self.budget_bytes:
+                return
+            while self._entries and self.used_bytes + size > self.budget_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.used_bytes -= len(evicted)
+            self._entries[key] = value
+            self.used_bytes += size
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "used_bytes": self.used_bytes, "budget_bytes": self.budget_bytes}
+
+@st.cache_resource(show_spinner=False)
+def _image_memory():
+    return ImageMemoryManager(int(IMAGE_CACHE_BUDGET_MB * 1024 * 1024))
+
+def _preshrunk_image_path(image_file):
+    """Zmniejszona kopia oryginału na dysku (tworzona raz) — kolejne dekodowania są tanie."""
+    target = os.path.join(IMAGE_CACHE_DIR, f"{PRESHRINK_SIZE}-{os.path.basename(image_file)}")
+    try:
+        if os.path.getmtime(target) >= os.path.getmtime(image_file):
+            return target
+    except OSError:
+        pass
+    try:
+        with Image.open(image_file) as image:
+            image.draft(None, (PRESHRINK_SIZE, PRESHRINK_SIZE))
+            image.thumbnail((PRESHRINK_SIZE, PRESHRINK_SIZE), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            os.makedirs(IMAGE_CACHE_DIR, exist_ok=True)
+            tmp = f"{target}.{threading.get_ident()}.tmp"
+            image.save(tmp, format="PNG")
+        os.replace(tmp, target)
+        return target
+    except OSError:
+        # Brak zapisu na dysk (np. w chmurze) — dekoduj oryginał
+        return image_file
+
+def _decode_scaled(image_file, size):
+    """Dekodowanie od razu w docelowej skali: draft (JPEG) / reduce przed dokładnym resize."""
+    with Image.open(_preshrunk_image_path(image_file)) as image:
+        image.draft(None, (size, size))
+        factor = min(image.width, image.height) // size
+        if factor > 1:
+            image = image.reduce(factor)
+        return image.resize((size, size), Image.Resampling.LANCZOS)
+
+def get_thumbnail_base64(image_file, size):
+    """Miniatura PNG (base64) — liczona raz na plik i rozmiar, także z wątków prefetchu."""
+    memory = _image_memory()
+    key = (image_file, size)
+    cached = memory.get(key)
+    if cached is not None:
+        return cached
     if os.path.exists(image_file):
         try:
-            image = Image.open(image_file)
-            image = image.resize((150, 150), Image.Resampling.LANCZOS)
-            buffered = BytesIO()
-            image.save(buffered, format="PNG")
-            return base64.b64encode(buffered.getvalue()).decode()
+            img_str = image_to_base64(_decode_scaled(image_file, size))
+            memory.put(key, img_str)
+            return img_str
         except:
             return None
     return None
 
+def get_exercise_image_base64(exercise_name):
+    image_file = EXERCISE_IMAGES.get(exercise_name, "brak.png")
+    return get_thumbnail_base64(image_file, 150)
+
 def get_current_week_monday():
     today = date.today()
     days_since_monday = today.weekday()
@@ -397,29 +402,149 @@ def get_week_range():
 # =========================
 # GITHUB: wczytywanie i zapis
 # =========================
-def load_from_github() -> dict:
-    """Wczytaj JSON z GitHuba (gałąź/ścieżka z konfiguracji)."""
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+@st.cache_resource(show_spinner=False)
+def _github_sync_state():
+    """Wspólny dla sesji stan synchronizacji: ostatni znany commit pliku i jego surowa treść."""
+    return {"snapshot": None}  # (commit_sha, text) albo None, jeśli jeszcze nie pobrano
+
+def _github_snapshot():
+    return _github_sync_state()["snapshot"] or (None, None)
+
+def _remember_sync(commit_sha, text):
+    # Jedno przypisanie krotki — inne sesje nigdy nie zobaczą pary commit/treść „w połowie”
+    _github_sync_state()["snapshot"] = (commit_sha, text)
+
+def _git_blob_sha(text: str) -> str:
+    """SHA obiektu blob w gicie (to samo, co pole `sha` pliku w API GitHuba)."""
+    raw = text.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+def _apply_unified_patch(text: str, patch: str):
+    """Nałóż łatkę unified diff (pole `patch` z compare API) na tekst. None, jeśli się nie da."""
+    old = text.splitlines(keepends=True)
+    out, pos, last_tag = [], 0, None
+    for line in patch.split("\n"):
+        m = _HUNK_RE.match(line)
+        if m:
+            start, length = int(m.group(1)), int(m.group(2) or 1)
+            idx = start - 1 if length > 0 else start
+            if idx < pos or idx > len(old):
+                return None
+            out.extend(old[pos:idx])
+            pos, last_tag = idx, None
+        elif line.startswith("\\"):
+            # "\ No newline at end of file" dotyczy poprzedniej linii
+            if last_tag == "+" and out:
+                out[-1] = out[-1].rstrip("\n")
+        elif line[:1] in (" ", "-"):
+            if pos >= len(old) or old[pos].rstrip("\n") != line[1:]:
+                return None
+            if line[0] == " ":
+                out.append(old[pos])
+            pos, last_tag = pos + 1, line[0]
+        elif line[:1] == "+":
+            out.append(line[1:] + "\n")
+            last_tag = "+"
+    out.extend(old[pos:])
+    return "".join(out)
+
+def _gh_latest_commit_sha():
+    """SHA ostatniego commita na gałęzi, który zmienił plik z danymi (jedno małe zapytanie)."""
+    url = _gh_repo_url() + "/commits"
+    params = {"sha": REPO_BRANCH, "path": REPO_FILE_PATH, "per_page": 1}
+    r = requests.get(url, headers=_gh_headers(), params=params, timeout=15)
+    if r.status_code == 200:
+        commits = r.json()
+        return commits[0]["sha"] if commits else None
+    if r.status_code in (404, 409):
+        # Brak gałęzi / puste repo — traktuj jak brak pliku
+        return None
+    raise RuntimeError(f"GitHub commits API: {r.status_code}")
+
+def _gh_fetch_delta(base_sha, head_sha, old_text):
+    """Nowa treść pliku odtworzona z łatki compare API; None = trzeba pobrać całość."""
+    if not base_sha or not head_sha:
+        return None
+    url = f"{_gh_repo_url()}/compare/{base_sha}...{head_sha}"
+    r = requests.get(url, headers=_gh_headers(), timeout=15)
+    if r.status_code != 200:
+        return None
+    files = r.json().get("files", [])
+    for f in files:
+        if f.get("filename") != REPO_FILE_PATH:
+            continue
+        if f.get("status") == "removed":
+            return ""
+        patch = f.get("patch")
+        if not patch:
+            # GitHub pomija łatki dla zbyt dużych zmian
+            return None
+        new_text = _apply_unified_patch(old_text, patch)
+        if new_text is None or _git_blob_sha(new_text) != f.get("sha"):
+            return None
+        return new_text
+    # Lista plików w compare jest ucinana na 300 pozycjach
+    return old_text if len(files) < 300 else None
+
+def _gh_fetch_full():
+    """Pełne pobranie surowego tekstu pliku (zapamiętane do synchronizacji przyrostowej)."""
     if not github_config_ok():
-        return {}
+        return None
     try:
-        # GET /contents/{path}?ref=branch
-        url = _gh_contents_url() + f"?ref={REPO_BRANCH}"
-        r = requests.get(url, headers=_gh_headers(), timeout=15)
+        commit_sha = _gh_latest_commit_sha()
+        # GET /contents/{path}?ref=commit — treść dokładnie z zapamiętanego commita
+        r = requests.get(_gh_contents_url(), headers=_gh_headers(),
+                         params={"ref": commit_sha or REPO_BRANCH}, timeout=15)
         if r.status_code == 200:
             content_b64 = r.json().get("content", "")
             if content_b64:
                 decoded = base64.b64decode(content_b64).decode("utf-8")
-                return json.loads(decoded)
-            return {}
+                _remember_sync(commit_sha, decoded)
+                return decoded
+            return None
         elif r.status_code == 404:
-            # Plik nie istnieje — zwróć pusty słownik (utworzymy przy zapisie)
-            return {}
+            # Plik nie istnieje — pusty tekst (utworzymy przy zapisie)
+            _remember_sync(commit_sha, "")
+            return ""
         else:
             st.warning(f"Nie udało się wczytać danych z GitHuba: {r.status_code}")
-            return {}
+            return None
     except Exception as e:
         st.warning(f"Błąd połączenia z GitHub: {e}")
-        return {}
+        return None
+
+def load_from_github() -> dict:
+    """Wczytaj JSON z GitHuba (pełne pobranie) i zapamiętaj commit do synchronizacji przyrostowej."""
+    text = _gh_fetch_full()
+    return json.loads(text) if text else {}
+
+def sync_from_github() -> bool:
+    """Przyrostowa synchronizacja z GitHubem. Zwraca True, jeśli treść pliku się zmieniła.
+
+    Bez zmian kosztuje jedno zapytanie o ostatni commit ścieżki; przy zmianach pobierana
+    jest tylko łatka z compare API (pełne pobranie wyłącznie jako fallback).
+    """
+    if not github_config_ok():
+        return False
+    base_sha, old_text = _github_snapshot()
+    if old_text is None:
+        _gh_fetch_full()
+        return _github_snapshot()[1] is not None
+    try:
+        head_sha = _gh_latest_commit_sha()
+        if head_sha == base_sha:
+            return False
+        new_text = _gh_fetch_delta(base_sha, head_sha, old_text)
+    except Exception as e:
+        st.warning(f"Błąd połączenia z GitHub: {e}")
+        return False
+    if new_text is None:
+        _gh_fetch_full()
+    else:
+        _remember_sync(head_sha, new_text)
+    return True
 
 def save_to_github(data_dict: dict, commit_message: str = "Update gym progress"):
     """Zapis JSON do repo GitHub: tworzy plik, jeśli nie ma; aktualizuje, jeśli jest."""
@@ -427,11 +552,15 @@ def save_to_github(data_dict: dict, commit_message: str = "Update gym progress")
         st.error("Brak konfiguracji GitHub w st.secrets — zapis tylko lokalny.")
         return False
 
+    def fetch_sha():
+        get_resp = requests.get(url, headers=_gh_headers(), params={"ref": REPO_BRANCH}, timeout=15)
+        return get_resp.json().get("sha") if get_resp.status_code == 200 else None
+
     try:
-        # Najpierw pobierz SHA (jeśli plik istnieje)
+        # SHA pliku znamy z synchronizacji; GET tylko, gdy jeszcze nic nie pobrano
         url = _gh_contents_url()
-        get_resp = requests.get(url, headers=_gh_headers(), timeout=15)
-        sha = get_resp.json().get("sha") if get_resp.status_code == 200 else None
+        _, synced_text = _github_snapshot()
+        sha = _git_blob_sha(synced_text) if synced_text else fetch_sha()
 
         json_str = json.dumps(data_dict, ensure_ascii=False, indent=2)
         encoded_content = base64.b64encode(json_str.encode("utf-8")).decode("utf-8")
@@ -445,7 +574,16 @@ def save_to_github(data_dict: dict, commit_message: str = "Update gym progress")
             payload["sha"] = sha  # wymagane przy aktualizacji
 
         put_resp = requests.put(url, headers=_gh_headers(), json=payload, timeout=15)
+        if put_resp.status_code in (409, 422):  # nieaktualne SHA
+            sha = fetch_sha()
+            if sha:
+                payload["sha"] = sha
+                put_resp = requests.put(url, headers=_gh_headers(), json=payload, timeout=15)
+
         if put_resp.status_code in (200, 201):
+            commit_sha = (put_resp.json().get("commit") or {}).get("sha")
+            if commit_sha:
+                _remember_sync(commit_sha, json_str)
             return True
         else:
             st.error(f"❌ Błąd zapisu do GitHuba: {put_resp.status_code} - {put_resp.text}")
@@ -455,15 +593,92 @@ def save_to_github(data_dict: dict, commit_message: str = "Update gym progress")
         return False
 
 # =========================
-# DANE: warstwa pośrednia (cache + fallback)
+# DANE: retencja historii (rollup)
+# =========================
+def _months_ago(day: date, months: int) -> date:
+    """Pierwszy dzień miesiąca sprzed `months` miesięcy (stała granica w obrębie miesiąca)."""
+    total = day.year * 12 + day.month - 1 - months
+    return date(total // 12, total % 12 + 1, 1)
+
+def _next_monday(day: date) -> date:
+    return day + timedelta(days=(7 - day.weekday()) % 7)
+
+def _rollup_bucket(record_date: date, raw_cutoff: date, weekly_cutoff: date):
+    if record_date >= raw_cutoff:
+        return None, None
+    if record_date >= weekly_cutoff:
+        # Tydzień dzielony na granicy miesiąca — agregat zawsze leży w jednym miesiącu,
+        # więc późniejsze przeniesienie do poziomu miesięcznego niczego nie przesuwa
+        monday = record_date - timedelta(days=record_date.weekday())
+        return "week", max(monday, record_date.replace(day=1))
+    return "month", record_date.replace(day=1)
+
+def compact_records(records, today=None, raw_months=None):
+    """Zwiń historię jednego ćwiczenia do poziomów retencji (idempotentnie).
+
+    Agregat ma postać {"date", "weight" (= max), "mean", "count", "period"}, więc wykresy
+    i statystyki czytają go tak samo jak zwykły wpis. Bez skonfigurowanej retencji
+    (i bez `raw_months`) zwraca wpisy bez zmian.
+    """
+    raw_months = raw_months if raw_months is not None else RETENTION_RAW_MONTHS
+    if raw_months is None:
+        return list(records)
+    today = today or date.today()
+    # Obie granice na poniedziałkach — żaden tydzień nie leży po obu stronach którejkolwiek
+    raw_cutoff = _next_monday(_months_ago(today, raw_months))
+    weekly_cutoff = _next_monday(_months_ago(today, max(RETENTION_WEEKLY_MONTHS, raw_months)))
+
+    raw, buckets = [], {}
+    for record in records:
+        record_date = datetime.strptime(record["date"], "%Y-%m-%d").date()
+        period, start = _rollup_bucket(record_date, raw_cutoff, weekly_cutoff)
+        if period is None:
+            raw.append(record)
+            continue
+        count = record.get("count", 1)
+        mean = record.get("mean", record["weight"])
+        agg = buckets.setdefault((period, start), {"weight": record["weight"], "total": 0.0, "count": 0})
+        agg["weight"] = max(agg["weight"], record["weight"])
+        agg["total"] += mean * count
+        agg["count"] += count
+
+    compacted = [
+        {
+            "date": start.strftime("%Y-%m-%d"),
+            "weight": agg["weight"],
+            "mean": round(agg["total"] / agg["count"], 2),
+            "count": agg["count"],
+            "period": period,
+        }
+        for (period, start), agg in buckets.items()
+    ]
+    return sorted(compacted + raw, key=lambda x: x["date"])
+
+def compact_history(data, today=None) -> bool:
+    """Zastosuj retencję do wszystkich ćwiczeń (w miejscu). Zwraca True, jeśli coś zwinięto."""
+    if RETENTION_RAW_MONTHS is None:
+        return False
+    changed = False
+    for exercise_name, records in data.items():
+        compacted = compact_records(records, today=today)
+        if compacted != records:
+            data[exercise_name] = compacted
+            changed = True
+    return changed
+
+# =========================
+# DANE: warstwa pośrednia (synchronizacja + fallback)
 # =========================
-@st.cache_data(show_spinner=False)
 def _initial_load_data():
-    """Jednorazowe wczytanie danych przy starcie sesji."""
-    # 1) Spróbuj z GitHuba
-    gh_data = load_from_github()
-    if gh_data:
-        return gh_data
+    """Wczytanie danych przy starcie sesji (lub odświeżeniu)."""
+    # 1) Spróbuj z GitHuba — przyrostowo względem stanu wspólnego dla sesji
+    sync_from_github()
+    _, synced_text = _github_snapshot()
+    if synced_text:
+        try:
+            return json.loads(synced_text)
+        except ValueError:
+            pass
     # 2) Fallback: lokalny plik (np. podczas pracy lokalnej)
     if os.path.exists(DATA_FILE):
         try:
@@ -481,7 +696,8 @@ def load_data():
 
 def save_data(data, commit_message="Update gym progress"):
     """Zapis lokalny (cache + plik) + commit do GitHuba."""
-    # 1) Aktualizuj cache w sesji
+    # 1) Zwiń starą historię (jeśli włączono retencję) i zaktualizuj cache w sesji
+    compact_history(data)
     st.session_state.data_store = data
 
     # 2) Opcjonalny zapis lokalny (przydatny lokalnie)
@@ -498,6 +714,15 @@ def save_data(data, commit_message="Update gym progress"):
         st.toast("✅ Zapisano do GitHuba", icon="✅")
     return ok
 
+# =========================
+# UI: odświeżanie danych
+# =========================
+if st.sidebar.button("🔄 Odśwież dane"):
+    # Przy braku zmian: jedno zapytanie o ostatni commit; inaczej tylko łatka z compare API
+    st.session_state.pop("data_store", None)
+    load_data()
+    st.toast("🔄 Dane odświeżone", icon="🔄")
+
 # =========================
 # LOGIKA ĆWICZEŃ
 # =========================
@@ -538,16 +763,22 @@ def get_week_completion_stats():
     completion_percentage = (completed_exercises / total_exercises * 100) if total_exercises > 0 else 0
     return completed_exercises, total_exercises, completion_percentage
 
-def create_progress_chart(exercise_name):
-    data = get_exercise_data(exercise_name)
-    if not data:
-        st.info("🎯 Dodaj pierwsze dane, aby zobaczyć wykres postępu!")
-        return
-
-    df = pd.DataFrame(data)
+@st.cache_data(show_spinner=False, max_entries=len(EXERCISES) * 2)
+def _cached_progress_frame(exercise_name, fingerprint, _records):
+    # Klucz to (ćwiczenie, odcisk treści) — Streamlit nie haszuje całej listy rekordów
+    df = pd.DataFrame(_records)
     df['date'] = pd.to_datetime(df['date'])
-    df = df.sort_values('date')
+    return df.sort_values('date')
 
+def _progress_frame(exercise_name, records):
+    """Posortowana ramka danych do wykresu (cache — podgrzewana przez prefetch)."""
+    # Tani odcisk pól używanych na wykresie — każda zmiana wartości (np. poprawka literówki
+    # na GitHubie) daje nowy klucz, nawet przy tej samej liczbie wpisów i ostatniej dacie
+    fingerprint = hash(tuple((r["date"], r["weight"], r.get("mean"), r.get("count")) for r in records))
+    return _cached_progress_frame(exercise_name, fingerprint, records)
+
+def build_progress_figure(exercise_name, df):
+    """Wykres postępu (wspólny dla aplikacji i raportu statycznego)."""
     fig = go.Figure()
     fig.add_trace(go.Scatter(
         x=df['date'], y=df['weight'], mode='lines+markers',
@@ -564,6 +795,16 @@ def create_progress_chart(exercise_name):
     )
     fig.update_xaxes(showgrid=True, gridwidth=1, gridcolor='#E8E8E8', tickformat="%Y-%m-%d", dtick="D1")
     fig.update_yaxes(showgrid=True, gridwidth=1, gridcolor='#E8E8E8')
+    return fig
+
+def create_progress_chart(exercise_name):
+    data = get_exercise_data(exercise_name)
+    if not data:
+        st.info("🎯 Dodaj pierwsze dane, aby zobaczyć wykres postępu!")
+        return
+
+    df = _progress_frame(exercise_name, data)
+    fig = build_progress_figure(exercise_name, df)
     st.plotly_chart(fig, use_container_width=True, config={"staticPlot": True})
 
     if len(df) > 0:
@@ -584,7 +825,9 @@ def create_progress_chart(exercise_name):
             </div>
             ''', unsafe_allow_html=True)
         with col3:
-            progress = df['weight'].iloc[-1] - df['weight'].iloc[0] if len(df) > 1 else 0
+            # Agregaty retencji mają "weight" = max — postęp liczony ze średnich, jak dla pojedynczych wpisów
+            values = df['mean'].fillna(df['weight']) if 'mean' in df else df['weight']
+            progress = values.iloc[-1] - values.iloc[0] if len(df) > 1 else 0
             st.markdown(f'''
             <div class="metric-card">
                 <div style="font-size: 1.2rem; color: #666;">📊 Postęp</div>
@@ -593,6 +836,36 @@ def create_progress_chart(exercise_name):
             ''', unsafe_allow_html=True)
         st.markdown('</div>', unsafe_allow_html=True)
 
+# =========================
+# PREFETCH: start sesji
+# =========================
+@st.cache_resource(show_spinner=False)
+def _prefetch_pool():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="gym-prefetch")
+
+def start_prefetch():
+    """Zimny start sesji: miniatury liczą się w tle, gdy wątek skryptu czeka na GitHuba.
+
+    Po wczytaniu danych podgrzewane są wykresy ćwiczeń z dzisiejszego dnia planu
+    (najbardziej prawdopodobna następna strona).
+    """
+    if "data_store" in st.session_state:
+        return
+    pool = _prefetch_pool()
+    today_exercises = WEEKLY_PLAN[DAYS_POLISH[date.today().weekday()]]["exercises"]
+    # Dzisiejszy dzień najpierw — jego karty i strona ćwiczenia są potrzebne najszybciej
+    ordered = list(dict.fromkeys(today_exercises + [ex for d in WEEKLY_PLAN.values() for ex in d["exercises"]]))
+    st.session_state.prefetch_thumbs = {
+        ex: pool.submit(get_thumbnail_base64, EXERCISE_IMAGES.get(ex, "brak.png"), 160) for ex in ordered
+    }
+    for ex in today_exercises:
+        pool.submit(get_thumbnail_base64, EXERCISE_IMAGES.get(ex, "brak.png"), 80)
+
+    data = load_data()
+    for ex in today_exercises:
+        if data.get(ex):
+            pool.submit(_progress_frame, ex, list(data[ex]))
+
 # =========================
 # STRONY
 # =========================
@@ -605,18 +878,9 @@ def exercise_page(exercise_name):
     col1, col2 = st.columns([1, 3])
     with col1:
         image_file = EXERCISE_IMAGES.get(exercise_name, "brak.png")
-        if os.path.exists(image_file):
-            try:
-                image = Image.open(image_file)
-                image = image.resize((80, 80), Image.Resampling.LANCZOS)
-                st.image(image, width=80)
-            except:
-                st.markdown(f"""
-                <div style="width: 180px; height: 180px; border-radius: 15px; 
-                           background: linear-gradient(135deg, {EXERCISES[exercise_name]['color']}30, {EXERCISES[exercise_name]['color']}160);
-                           display: flex; align-items: center; justify-content: center; 
-                           font-size: 2rem; color: white; margin: auto;">💪</div>
-                """, unsafe_allow_html=True)
+        img_str = get_thumbnail_base64(image_file, 80)
+        if img_str:
+            st.image(base64.b64decode(img_str), width=80)
         else:
             st.markdown(f"""
             <div style="width: 180px; height: 180px; border-radius: 15px; 
@@ -658,6 +922,31 @@ def exercise_page(exercise_name):
     st.markdown("---")
     create_progress_chart(exercise_name)
 
+def _exercise_card_html(exercise, color, is_completed, img_str):
+    completion_icon = "✅" if is_completed else "⭕"
+    completed_class = "completed" if is_completed else ""
+    if img_str:
+        image_html = f'<img src="data:image/png;base64,{img_str}" style="width: 160px; height: 160px; border-radius: 8px; object-fit: cover; border: 2px solid #f8f9fa;">'
+    else:
+        image_html = f"""
+        <div style="width: 160px; height: 160px; border-radius: 8px; 
+                   background: linear-gradient(135deg, {color}30, {color}160);
+                   display: flex; align-items: center; justify-content: center; 
+                   font-size: 1.8rem; color: white; flex-shrink: 0;">💪</div>
+        """
+    return f"""
+    <div class="exercise-container {completed_class}">
+        <div class="exercise-image-container">{image_html}</div>
+        <div class="exercise-content">
+            <div class="exercise-name">{exercise}</div>
+            <div class="exercise-footer">
+                <div class="exercise-description">{EXERCISES[exercise]['description']}</div>
+                <div class="exercise-status">{completion_icon}</div>
+            </div>
+        </div>
+    </div>
+    """
+
 def main_page():
     monday, sunday = get_week_range()
     completed, total, percentage = get_week_completion_stats()
@@ -670,8 +959,9 @@ def main_page():
 
     st.progress(percentage / 100)
 
-    days_polish = ["Poniedziałek", "Wtorek", "Środa", "Czwartek", "Piątek", "Sobota", "Niedziela"]
-    for day in days_polish:
+    prefetched = st.session_state.pop("prefetch_thumbs", {})
+    pending = []
+    for day in DAYS_POLISH:
         day_data = WEEKLY_PLAN[day]
         st.markdown(f"""
         <div class="day-container">
@@ -690,42 +980,17 @@ def main_page():
         else:
             for exercise in day_data["exercises"]:
                 is_completed = is_exercise_completed_this_week(exercise)
-                completion_icon = "✅" if is_completed else "⭕"
-                completed_class = "completed" if is_completed else ""
-                image_html = ""
                 image_file = EXERCISE_IMAGES.get(exercise, "brak.png")
-                if os.path.exists(image_file):
-                    try:
-                        image = Image.open(image_file); image = image.resize((160, 160), Image.Resampling.LANCZOS)
-                        buffered = BytesIO(); image.save(buffered, format="PNG")
-                        img_str = base64.b64encode(buffered.getvalue()).decode()
-                        image_html = f'<img src="data:image/png;base64,{img_str}" style="width: 160px; height: 160px; border-radius: 8px; object-fit: cover; border: 2px solid #f8f9fa;">'
-                    except:
-                        image_html = f"""
-                        <div style="width: 160px; height: 160px; border-radius: 8px; 
-                                   background: linear-gradient(135deg, {day_data['color']}30, {day_data['color']}160);
-                                   display: flex; align-items: center; justify-content: center; 
-                                   font-size: 1.8rem; color: white; flex-shrink: 0;">💪</div>
-                        """
+                card = st.empty()
+                future = prefetched.get(exercise)
+                if future is not None and not future.done():
+                    # Miniatura jeszcze się liczy — placeholder teraz, obraz po przejściu pętli
+                    pending.append((card, future, exercise, day_data['color'], is_completed))
+                    img_str = None
                 else:
-                    image_html = f"""
-                    <div style="width: 160px; height: 160px; border-radius: 8px; 
-                               background: linear-gradient(135deg, {day_data['color']}30, {day_data['color']}160);
-                               display: flex; align-items: center; justify-content: center; 
-                               font-size: 1.8rem; color: white; flex-shrink: 0;">💪</div>
-                    """
-                st.markdown(f"""
-                <div class="exercise-container {completed_class}">
-                    <div class="exercise-image-container">{image_html}</div>
-                    <div class="exercise-content">
-                        <div class="exercise-name">{exercise}</div>
-                        <div class="exercise-footer">
-                            <div class="exercise-description">{EXERCISES[exercise]['description']}</div>
-                            <div class="exercise-status">{completion_icon}</div>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                    img_str = get_thumbnail_base64(image_file, 160)
+                card.markdown(_exercise_card_html(exercise, day_data['color'], is_completed, img_str),
+                              unsafe_allow_html=True)
                 exercise_short = exercise.split(' - ')[0][:30] + "..." if len(exercise) > 30 else exercise
                 if st.button(f"➤ {exercise_short}", key=f"{day}_{exercise}", use_container_width=True):
                     st.session_state.selected_exercise = exercise
@@ -733,13 +998,273 @@ def main_page():
                     st.rerun()
         st.markdown("</div>", unsafe_allow_html=True)
 
+    for card, future, exercise, color, is_completed in pending:
+        card.markdown(_exercise_card_html(exercise, color, is_completed, future.result()),
+                      unsafe_allow_html=True)
+
+# =========================
+# EKSPORT: API tylko do odczytu + raport statyczny (bez UI)
+# =========================
+EXPORT_FIELDS = ["exercise", "date", "weight", "mean", "count", "period"]
+
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+
+# Tryb headless nie ma session_state — źródło danych trzymane w zwykłym obiekcie modułu,
+# współdzielonym przez wątki `serve` (stąd blokada)
+_headless_lock = threading.Lock()
+_headless_source = {"mtime": None, "text": ""}
+
+def _export_text():
+    """Surowy tekst JSON do eksportu: przyrostowo z GitHuba albo z lokalnego pliku (po zmianie mtime)."""
+    with _headless_lock:
+        if github_config_ok():
+            sync_from_github()
+            _, synced_text = _github_snapshot()
+            if synced_text:
+                return synced_text
+        mtime = os.path.getmtime(DATA_FILE) if os.path.exists(DATA_FILE) else None
+        if _headless_source["mtime"] != mtime:
+            text = ""
+            if mtime is not None:
+                with open(DATA_FILE, "r", encoding="utf-8") as f:
+                    text = f.read()
+            _headless_source.update(mtime=mtime, text=text)
+        return _headless_source["text"]
+
+def iter_json_records(text):
+    """Pary (ćwiczenie, rekord) wprost z tekstu {"ćwiczenie": [rekordy...]}.
+
+    Rekordy dekodowane pojedynczo (`raw_decode`), więc poza samym tekstem pamięć nie rośnie
+    z długością historii — bez słownika wszystkich rekordów i bez DataFrame.
+    """
+    decoder = json.JSONDecoder()
+
+    def skip(pos):
+        return _JSON_WS.match(text, pos).end()
+
+    def expect(pos, char):
+        pos = skip(pos)
+        if text[pos:pos + 1] != char:
+            raise ValueError(f"Nieprawidłowy JSON: oczekiwano {char!r} na pozycji {pos}")
+        return pos + 1
+
+    if not text.strip():
+        return
+    pos = skip(expect(0, "{"))
+    if text[pos:pos + 1] == "}":
+        return
+    while True:
+        exercise_name, pos = decoder.raw_decode(text, skip(pos))
+        pos = skip(expect(expect(pos, ":"), "["))
+        if text[pos:pos + 1] == "]":
+            pos += 1
+        else:
+            while True:
+                record, pos = decoder.raw_decode(text, skip(pos))
+                yield exercise_name, record
+                pos = skip(pos)
+                if text[pos:pos + 1] != ",":
+                    pos = expect(pos, "]")
+                    break
+                pos += 1
+        pos = skip(pos)
+        if text[pos:pos + 1] != ",":
+            expect(pos, "}")
+            return
+        pos += 1
+
+def _iso_date(value):
+    """Data YYYY-MM-DD znormalizowana do ISO (porównywalna z polem `date`); ValueError przy błędnej."""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"Nieprawidłowa data: {value!r} (oczekiwano YYYY-MM-DD)")
+
+def _cli_date(value):
+    try:
+        return _iso_date(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def iter_export_records(pairs, exercise=None, since=None, until=None):
+    """Płaskie rekordy jako generator (`since`/`until` — daty ISO z `_iso_date`)."""
+    for exercise_name, record in pairs:
+        if exercise and exercise_name != exercise:
+            continue
+        if (since and record["date"] < since) or (until and record["date"] > until):
+            continue
+        yield {"exercise": exercise_name, **record}
+
+def write_ndjson(rows, out):
+    for row in rows:
+        out.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+
+def _weekly_report_sections(text, monday):
+    """Jedno przejście po danych: dla każdego ćwiczenia wpisy z tygodnia i wykres.
+
+    Rekordy ćwiczenia leżą w pliku obok siebie, więc w pamięci jest naraz tylko jedno ćwiczenie.
+    """
+    sunday = monday + timedelta(days=6)
+    monday_iso, sunday_iso = monday.isoformat(), sunday.isoformat()
+    # Tylko do wykresu (nic nie zapisujemy) — zwijanie ogranicza liczbę punktów
+    fold = partial(compact_records, today=sunday, raw_months=RETENTION_RAW_MONTHS or 6)
+    for exercise_name, group in groupby(iter_json_records(text), key=itemgetter(0)):
+        records, week_rows, fold_at = [], [], 10000
+        for _, record in group:
+            if record["date"] > sunday_iso:
+                continue
+            if record["date"] >= monday_iso:
+                week_rows.append({"exercise": exercise_name, **record})
+            records.append(record)
+            if len(records) >= fold_at:
+                # Zwijanie porcjami daje ten sam wynik co całościowe (patrz testy retencji)
+                records = fold(records)
+                fold_at = max(10000, 2 * len(records))
+        fig = None
+        if records and exercise_name in EXERCISES:
+            df = pd.DataFrame(fold(records))
+            df['date'] = pd.to_datetime(df['date'])
+            fig = build_progress_figure(exercise_name, df.sort_values('date'))
+        yield week_rows, fig
+
+def render_weekly_report(text, monday, png_dir=None, png_paths=None):
+    """Samodzielny raport HTML (plotly.js wbudowany — działa offline); opcjonalnie PNG wykresów."""
+    sunday = monday + timedelta(days=6)
+    week_rows, charts = [], []
+    for rows, fig in _weekly_report_sections(text, monday):
+        week_rows += rows
+        if fig is None:
+            continue
+        charts.append(fig.to_html(full_html=False, include_plotlyjs=False, config={"staticPlot": True}))
+        if png_dir:
+            png_path = os.path.join(png_dir, f"raport-{monday.isoformat()}-{len(charts):02d}.png")
+            fig.write_image(png_path)
+            png_paths.append(png_path)
+    table = "".join(
+        f"<tr><td>{html.escape(str(row['date']))}</td><td>{html.escape(str(row['exercise']))}</td>"
+        f"<td>{html.escape(str(row['weight']))}</td></tr>"
+        for row in sorted(week_rows, key=lambda x: x["date"])
+    )
+    return f"""<!DOCTYPE html>
+<html lang="pl"><head><meta charset="utf-8">
+<title>Raport tygodniowy {monday.strftime('%d.%m')} - {sunday.strftime('%d.%m.%Y')}</title>
+<script>{get_plotlyjs()}</script></head>
+<body style="font-family: sans-serif; max-width: 960px; margin: auto;">
+<h1>💪 Raport tygodniowy: {monday.strftime('%d.%m')} - {sunday.strftime('%d.%m.%Y')}</h1>
+<table border="1" cellpadding="6" style="border-collapse: collapse;">
+<tr><th>Data</th><th>Ćwiczenie</th><th>Ciężar</th></tr>{table or '<tr><td colspan="3">Brak treningów w tym tygodniu</td></tr>'}
+</table>
+{"".join(charts)}
+</body></html>"""
+
+def write_weekly_report(text, monday, out_dir, png=False):
+    """Zapisz raport HTML (i opcjonalnie PNG wykresów, jeśli zainstalowane jest kaleido)."""
+    os.makedirs(out_dir, exist_ok=True)
+    png_paths = []
+    if png and importlib.util.find_spec("kaleido") is None:
+        print("Pomijam PNG: brak pakietu kaleido (pip install kaleido).", file=sys.stderr)
+        png = False
+    report = render_weekly_report(text, monday, png_dir=out_dir if png else None, png_paths=png_paths)
+    html_path = os.path.join(out_dir, f"raport-{monday.isoformat()}.html")
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(report)
+    return [html_path] + png_paths
+
+class ExportRequestHandler(BaseHTTPRequestHandler):
+    """Lokalny endpoint dla integracji: /export.ndjson, /export.csv, /report.html."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        try:
+            if url.path in ("/export.ndjson", "/export.csv"):
+                ndjson = url.path.endswith(".ndjson")
+                since = _iso_date(query["since"]) if "since" in query else None
+                until = _iso_date(query["until"]) if "until" in query else None
+                rows = iter_export_records(iter_json_records(_export_text()), exercise=query.get("exercise"),
+                                           since=since, until=until)
+                self._start(200, "application/x-ndjson" if ndjson else "text/csv")
+                # Bez Content-Length — odpowiedź strumieniowana wiersz po wierszu
+                out = TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+                (write_ndjson if ndjson else write_csv)(rows, out)
+                out.detach()
+            elif url.path == "/report.html":
+                week = date.fromisoformat(_iso_date(query["week"])) if "week" in query else date.today()
+                body = render_weekly_report(_export_text(), week - timedelta(days=week.weekday())).encode("utf-8")
+                self._start(200, "text/html")
+                self.wfile.write(body)
+            else:
+                self._start(404, "text/plain")
+                self.wfile.write(b"Not found")
+        except ValueError as e:
+            self._start(400, "text/plain")
+            self.wfile.write(str(e).encode("utf-8"))
+
+    def _start(self, status, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+def export_main(argv=None):
+    """Wejście headless: `python app.py export|report|serve ...` (poza `streamlit run`)."""
+    parser = argparse.ArgumentParser(prog="app.py", description="Eksport danych treningowych (tylko odczyt).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_export = sub.add_parser("export", help="Strumieniowy eksport NDJSON/CSV")
+    p_export.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    p_export.add_argument("--exercise")
+    p_export.add_argument("--since", type=_cli_date, help="YYYY-MM-DD")
+    p_export.add_argument("--until", type=_cli_date, help="YYYY-MM-DD")
+    p_export.add_argument("-o", "--output", help="Plik wyjściowy (domyślnie stdout)")
+    p_report = sub.add_parser("report", help="Statyczny raport tygodniowy HTML/PNG")
+    p_report.add_argument("--week", type=_cli_date, help="Dowolny dzień tygodnia (YYYY-MM-DD), domyślnie bieżący")
+    p_report.add_argument("--out-dir", default="reports")
+    p_report.add_argument("--png", action="store_true")
+    p_serve = sub.add_parser("serve", help="Lokalny endpoint HTTP dla integracji")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        rows = iter_export_records(iter_json_records(_export_text()), exercise=args.exercise,
+                                   since=args.since, until=args.until)
+        writer = write_ndjson if args.format == "ndjson" else write_csv
+        if args.output:
+            with open(args.output, "w", encoding="utf-8", newline="") as f:
+                writer(rows, f)
+        else:
+            writer(rows, sys.stdout)
+    elif args.command == "report":
+        week = date.fromisoformat(args.week) if args.week else date.today()
+        for path in write_weekly_report(_export_text(), week - timedelta(days=week.weekday()), args.out_dir, png=args.png):
+            print(path)
+    else:
+        server = ThreadingHTTPServer((args.host, args.port), ExportRequestHandler)
+        print(f"Eksport dostępny pod http://{args.host}:{args.port}/export.ndjson", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+# Uruchomione jako zwykły skrypt (nie przez `streamlit run`) — tryb eksportu bez UI
+if __name__ == "__main__" and not st.runtime.exists():
+    sys.exit(export_main())
+
 # =========================
 # INICJALIZACJA
 # =========================
 if 'selected_exercise' not in st.session_state:
     st.session_state.selected_exercise = None
 
-# Jednorazowy „start” — wczytaj dane do cache
+# Jednorazowy „start” — dane z GitHuba równolegle z miniaturami, potem wykresy dnia
+start_prefetch()
 _ = load_data()
 
 # Parametry URL
@@ -756,3 +1281,13 @@ if st.session_state.selected_exercise is not None:
     exercise_page(st.session_state.selected_exercise)
 else:
     main_page()
+
+# =========================
+# UI: panel debug
+# =========================
+with st.sidebar.expander("🛠️ Debug"):
+    image_stats = _image_memory().stats()
+    st.caption(
+        f"🖼️ Obrazy w pamięci: {image_stats['used_bytes'] / 1024 / 1024:.2f} / "
+        f"{image_stats['budget_bytes'] / 1024 / 1024:.0f} MB ({image_stats['entries']} miniatur)"
+    )
@@ -0,0 +1,26 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    # app.py to skrypt Streamlit — import w trybie "bare" z pustymi sekretami i bez danych
+    workdir = tmp_path_factory.mktemp("app")
+    (workdir / ".streamlit").mkdir()
+    (workdir / ".streamlit" / "secrets.toml").write_text("x = 1\n")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        spec = importlib.util.spec_from_file_location("gym_app", APP_PATH)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["gym_app"] = module
+        spec.loader.exec_module(module)
+        yield module
+    finally:
+        os.chdir(cwd)
+        sys.modules.pop("gym_app", None)
@@ -0,0 +1,60 @@
+import io
+import json
+from datetime import date
+
+import pytest
+
+DATA = {
+    "Wypychanie nóg (Leg Press)": [{"date": "2025-08-15", "weight": 100.0}, {"date": "2025-08-18", "weight": 110.0}],
+    "Pusta": [],
+    "<script>alert(1)</script>": [{"date": "2025-08-19", "weight": "<b>1</b>"}],
+    "Bieżnia": [{"date": "2025-08-17", "weight": 30, "mean": 25.5, "count": 3, "period": "week"}],
+}
+
+
+def _pairs(data):
+    return [(name, record) for name, records in data.items() for record in records]
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(DATA, ensure_ascii=False, indent=2),
+    json.dumps(DATA, separators=(",", ":")),
+    json.dumps({}),
+    "",
+])
+def test_iter_json_records_matches_json_loads(app, text):
+    expected = _pairs(json.loads(text)) if text else []
+    assert list(app.iter_json_records(text)) == expected
+
+
+@pytest.mark.parametrize("text", ['{"a": [1, 2}', '{"a": {}}', "[]"])
+def test_iter_json_records_rejects_malformed_input(app, text):
+    with pytest.raises(ValueError):
+        list(app.iter_json_records(text))
+
+
+def test_export_filters_use_normalized_dates(app):
+    rows = app.iter_export_records(_pairs(DATA), since=app._iso_date("2025-08-17"), until=app._iso_date("2025-08-18"))
+    assert [(r["exercise"], r["date"]) for r in rows] == [
+        ("Wypychanie nóg (Leg Press)", "2025-08-18"), ("Bieżnia", "2025-08-17")]
+
+
+@pytest.mark.parametrize("value", ["2025-8-1", "abc", ""])
+def test_invalid_dates_are_rejected(app, value):
+    with pytest.raises(ValueError):
+        app._iso_date(value)
+    with pytest.raises(SystemExit):
+        app.export_main(["export", "--since", value])
+
+
+def test_csv_export_streams_rows(app):
+    out = io.StringIO()
+    app.write_csv(app.iter_export_records(_pairs(DATA), exercise="Bieżnia"), out)
+    assert out.getvalue().splitlines() == ["exercise,date,weight,mean,count,period", "Bieżnia,2025-08-17,30,25.5,3,week"]
+
+
+def test_weekly_report_escapes_data_values(app):
+    report = app.render_weekly_report(json.dumps(DATA, ensure_ascii=False), date(2025, 8, 18))
+    assert "<script>alert(1)</script>" not in report
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in report
+    assert "&lt;b&gt;1&lt;/b&gt;" in report
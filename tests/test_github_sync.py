@@ -0,0 +1,167 @@
+import base64
+import difflib
+import hashlib
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+DATA_PATH = "gym_progress.json"
+
+
+def _blob_sha(text):
+    raw = text.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+
+def _github_patch(old, new):
+    """Łatka w formacie pola `patch` z compare API (bez nagłówków, z markerem braku \\n)."""
+    lines = []
+    for line in list(difflib.unified_diff(old.splitlines(True), new.splitlines(True)))[2:]:
+        if line.endswith("\n"):
+            lines.append(line[:-1])
+        else:
+            lines += [line, "\\ No newline at end of file"]
+    return "\n".join(lines)
+
+
+class FakeGitHub:
+    """Atrapa endpointów GitHuba używanych przez aplikację: commits, compare, contents."""
+
+    def __init__(self, text):
+        self.commits = [("c0", text)]
+        self.requests = []
+        self.drop_patch = False
+        self.corrupt_sha = False
+
+    @property
+    def head(self):
+        return self.commits[-1]
+
+    def push(self, text):
+        self.commits.append((f"c{len(self.commits)}", text))
+
+    def text_at(self, ref):
+        return dict(self.commits).get(ref, self.head[1])
+
+    def handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, obj):
+                body = json.dumps(obj).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                if url.path.endswith("/commits"):
+                    fake.requests.append("commits")
+                    return self._send(200, [{"sha": fake.head[0]}])
+                m = re.search(r"/compare/(\w+)\.\.\.(\w+)$", url.path)
+                if m:
+                    fake.requests.append("compare")
+                    old, new = fake.text_at(m.group(1)), fake.text_at(m.group(2))
+                    entry = {"filename": DATA_PATH, "status": "modified",
+                             "sha": "0" * 40 if fake.corrupt_sha else _blob_sha(new)}
+                    if not fake.drop_patch:
+                        entry["patch"] = _github_patch(old, new)
+                    return self._send(200, {"files": [entry] if old != new else []})
+                if url.path.endswith(f"/contents/{DATA_PATH}"):
+                    fake.requests.append("contents")
+                    text = fake.text_at(query.get("ref", [""])[0])
+                    return self._send(200, {"content": base64.b64encode(text.encode("utf-8")).decode(),
+                                            "sha": _blob_sha(text)})
+                self._send(404, {})
+
+            def do_PUT(self):
+                fake.requests.append("put")
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if payload.get("sha") != _blob_sha(fake.head[1]):
+                    return self._send(409, {})
+                fake.push(base64.b64decode(payload["content"]).decode("utf-8"))
+                self._send(200, {"commit": {"sha": fake.head[0]}, "content": {"sha": _blob_sha(fake.head[1])}})
+
+        return Handler
+
+
+def _dump(data):
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+INITIAL = {
+    "Wypychanie nóg (Leg Press)": [{"date": "2025-08-15", "weight": 100.0}, {"date": "2025-08-18", "weight": 110.0}],
+    "Bieżnia": [{"date": "2025-08-17", "weight": 30.0}],
+}
+
+
+@pytest.fixture
+def github(app, monkeypatch):
+    fake = FakeGitHub(_dump(INITIAL))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fake.handler())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(app, "GITHUB_API_URL", f"http://127.0.0.1:{server.server_address[1]}")
+    monkeypatch.setattr(app, "GITHUB_TOKEN", "token")
+    monkeypatch.setattr(app, "REPO_OWNER", "owner")
+    monkeypatch.setattr(app, "REPO_NAME", "repo")
+    monkeypatch.setattr(app, "REPO_FILE_PATH", DATA_PATH)
+    app._github_sync_state()["snapshot"] = None
+    assert app.sync_from_github()
+    fake.requests.clear()
+    yield fake
+    server.shutdown()
+    app._github_sync_state()["snapshot"] = None
+
+
+def _edited():
+    data = json.loads(json.dumps(INITIAL))
+    data["Wypychanie nóg (Leg Press)"][1]["weight"] = 112.5
+    data["Bieżnia"].append({"date": "2025-08-24", "weight": 35.0})
+    data["Plank"] = [{"date": "2025-08-25", "weight": 1.0}]
+    return data
+
+
+def test_unchanged_refresh_is_a_single_request(app, github):
+    assert app.sync_from_github() is False
+    assert github.requests == ["commits"]
+
+
+def test_changed_refresh_applies_compare_patch(app, github):
+    github.push(_dump(_edited()))
+    assert app.sync_from_github() is True
+    assert github.requests == ["commits", "compare"]
+    assert app._github_snapshot() == github.head
+
+
+@pytest.mark.parametrize("broken", ["drop_patch", "corrupt_sha"])
+def test_unusable_patch_falls_back_to_full_download(app, github, broken):
+    setattr(github, broken, True)
+    github.push(_dump(_edited()))
+    assert app.sync_from_github() is True
+    assert github.requests[-1] == "contents"
+    assert app._github_snapshot() == github.head
+
+
+def test_save_reuses_blob_sha_and_records_new_commit(app, github):
+    assert app.save_to_github(_edited())
+    assert github.requests == ["put"]
+    assert app._github_snapshot() == github.head
+    github.requests.clear()
+    assert app.sync_from_github() is False
+    assert github.requests == ["commits"]
+
+
+def test_apply_unified_patch_matches_difflib(app):
+    old = _dump(INITIAL)
+    for new in (_dump(_edited()), _dump({}), old + "\n", _dump(INITIAL).replace("100.0", "101.0")):
+        assert app._apply_unified_patch(old, _github_patch(old, new)) == new
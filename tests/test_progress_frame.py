@@ -0,0 +1,6 @@
+def test_progress_frame_reflects_edited_values(app):
+    records = [{"date": "2025-08-15", "weight": 100.0}, {"date": "2025-08-18", "weight": 110.0}]
+    assert list(app._progress_frame("X", records)["weight"]) == [100.0, 110.0]
+    edited = [dict(r) for r in records]
+    edited[1]["weight"] = 11.0
+    assert list(app._progress_frame("X", edited)["weight"]) == [100.0, 11.0]
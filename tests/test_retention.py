@@ -0,0 +1,69 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def retention(app, monkeypatch):
+    monkeypatch.setattr(app, "RETENTION_RAW_MONTHS", 6)
+    monkeypatch.setattr(app, "RETENTION_WEEKLY_MONTHS", 24)
+
+
+def _records(start, days, step=1, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"date": (start + timedelta(days=i)).strftime("%Y-%m-%d"), "weight": float(rng.randint(20, 100))}
+        for i in range(0, days, step)
+    ]
+
+
+def _assert_same_rollup(actual, expected):
+    assert [{k: v for k, v in r.items() if k != "mean"} for r in actual] == \
+        [{k: v for k, v in r.items() if k != "mean"} for r in expected]
+    # Średnia liczona ze średnich ważonych — różnice tylko z zaokrąglenia do 0.01
+    assert [r.get("mean") for r in actual] == pytest.approx([r.get("mean") for r in expected], abs=0.011)
+
+
+def test_compact_records_is_idempotent(app):
+    recs = _records(date(2022, 1, 1), 1700, step=2)
+    today = date(2026, 10, 19)
+    once = app.compact_records(recs, today=today)
+    assert app.compact_records(once, today=today) == once
+
+
+def test_stepwise_rollup_matches_rollup_from_scratch(app):
+    recs = _records(date(2022, 1, 1), 1750)
+    compacted = recs
+    day = date(2025, 1, 1)
+    while day <= date(2026, 10, 19):
+        compacted = app.compact_records(compacted, today=day)
+        _assert_same_rollup(compacted, app.compact_records(recs, today=day))
+        day += timedelta(days=9)
+
+
+def test_rollup_preserves_count_and_max_per_month(app):
+    recs = _records(date(2023, 1, 1), 1000)
+    compacted = app.compact_records(app.compact_records(recs, today=date(2025, 3, 1)), today=date(2026, 10, 19))
+    for month in {r["date"][:7] for r in recs}:
+        raw = [r for r in recs if r["date"][:7] == month]
+        rolled = [r for r in compacted if r["date"][:7] == month]
+        assert sum(r.get("count", 1) for r in rolled) == len(raw)
+        assert max(r["weight"] for r in rolled) == max(r["weight"] for r in raw)
+
+
+def test_cutoffs_do_not_split_weeks(app):
+    recs = _records(date(2025, 1, 1), 700)
+    compacted = app.compact_records(recs, today=date(2026, 10, 19))
+    raw_dates = [date.fromisoformat(r["date"]) for r in compacted if "period" not in r]
+    first_raw = min(raw_dates)
+    assert first_raw.weekday() == 0
+    assert all(date.fromisoformat(r["date"]) < first_raw for r in compacted if "period" in r)
+
+
+def test_rollup_is_opt_in(app, monkeypatch):
+    monkeypatch.setattr(app, "RETENTION_RAW_MONTHS", None)
+    data = {"Plank": _records(date(2020, 1, 1), 400)}
+    before = [dict(r) for r in data["Plank"]]
+    assert app.compact_history(data, today=date(2026, 10, 19)) is False
+    assert data["Plank"] == before